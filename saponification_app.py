@@ -1,9 +1,6 @@
 
 import streamlit as st
 import numpy as np
-from scipy.integrate import odeint
-import plotly.graph_objs as go
-from PIL import Image
 
 # Page setup
 st.set_page_config(page_title="🧼 Saponification Reaction Explorer", layout="wide")
@@ -34,6 +31,94 @@ tab_choice = st.sidebar.radio("Choose a section:", ["📘 Overview", "📐 Theor
 
 R = 8.314  # gas constant
 
+# Temperature (K) of each temperature-series run
+_LABEL_T = {"293K": 293.0, "303K": 303.0, "313K": 313.0}
+
+# Hover text shared by all traces
+_HOVER_TEMPLATE = "%{fullData.name}<br>Time: %{x} min<br>[NaOH]: %{y:.4f} mol/L<extra></extra>"
+
+# Experimental data as float32 arrays
+@st.cache_resource
+def get_datasets():
+    # Sampling times (s) shared by every run
+    times_sec = np.array([0, 480, 960, 1440, 1920, 2400, 2880], dtype=np.float32)
+    times_min = times_sec / 60.0
+    times_sec.setflags(write=False)
+    times_min.setflags(write=False)
+
+    # Al Mesfer (2017): label -> [NaOH] (mol/L)
+    raw = {
+        "Temperature": {
+            "293K": [0.0500, 0.0333, 0.0233, 0.0178, 0.0156, 0.0144, 0.0125],
+            "303K": [0.0500, 0.0256, 0.0189, 0.0144, 0.0122, 0.0100, 0.0078],
+            "313K": [0.0500, 0.0200, 0.0133, 0.0100, 0.0083, 0.0067, 0.0061]
+        },
+        "Volume": {
+            "1.2L": [0.0500, 0.0222, 0.0156, 0.0128, 0.0100, 0.0089, 0.0083],
+            "1.4L": [0.0500, 0.0289, 0.0222, 0.0178, 0.0156, 0.0144, 0.0133],
+            "1.8L": [0.0500, 0.031, 0.0289, 0.0256, 0.0222, 0.0200, 0.0167]
+        },
+        "Agitation Rate": {
+            "70rpm": [0.0500, 0.0189, 0.0133, 0.0100, 0.0078, 0.0067, 0.0056],
+            "110rpm": [0.0500, 0.0256, 0.0189, 0.0156, 0.0128, 0.0111, 0.0100],
+            "150rpm": [0.0500, 0.0333, 0.0267, 0.0222, 0.0200, 0.0178, 0.0156]
+        },
+        "Initial Concentration": {
+            "0.025M": [0.0500, 0.0360, 0.0260, 0.0200, 0.0160, 0.0120, 0.0111],
+            "0.050M": [0.0500, 0.0389, 0.0300, 0.0244, 0.0211, 0.0189, 0.0167],
+            "0.075M": [0.0500, 0.0392, 0.0313, 0.0256, 0.0222, 0.0200, 0.0178]
+        }
+    }
+
+    # param -> (labels, concentration matrix)
+    datasets = {}
+    for param, curves in raw.items():
+        conc_matrix = np.array(list(curves.values()), dtype=np.float32)
+        conc_matrix.setflags(write=False)
+        datasets[param] = (tuple(curves), conc_matrix)
+    return times_sec, times_min, datasets
+
+
+def simulate_curves(C0s, ks, t_sec):
+    # Closed-form solution of -dC/dt = kC^2
+    return C0s[:, None] / (1.0 + (ks * C0s)[:, None] * t_sec[None, :])
+
+
+# Simulated curves for every parameter
+@st.cache_data(max_entries=64)
+def simulate_all(A, Ea, T):
+    times_sec, _, datasets = get_datasets()
+    sims = {}
+    for parameter, (labels, conc_matrix) in datasets.items():
+        C0s = conc_matrix[:, 0].astype(float)
+        Ts = np.array([_LABEL_T.get(label, T) for label in labels], dtype=float)
+        ks = A * np.exp(-Ea / (R * Ts))
+        sims[parameter] = simulate_curves(C0s, ks, times_sec).astype(np.float32)
+    return sims
+
+
+# Fill the figure with one parameter's curves
+def update_fig(fig, parameter, A, Ea, T):
+    conc_sim_all = simulate_all(A, Ea, T)[parameter]
+
+    with fig.batch_update():
+        _, times_min, datasets = get_datasets()
+        labels, conc_matrix = datasets[parameter]
+        for i, label in enumerate(labels):
+            fig.data[2 * i].update(x=times_min, y=conc_matrix[i], name=f"Exp {label}")
+            fig.data[2 * i + 1].update(x=times_min, y=conc_sim_all[i], name=f"Sim {label}")
+
+        fig.layout.title = f"[NaOH] vs Time — Effect of {parameter}"
+
+
+# Serialize Plotly figures with orjson
+@st.cache_resource
+def _use_orjson():
+    import plotly.io as pio
+
+    pio.json.config.default_engine = "orjson"
+
+
 # ------------------------------
 if tab_choice == "📘 Overview":
     st.title("📘 Saponification Reaction Overview")
@@ -75,18 +160,24 @@ elif tab_choice == "📐 Theory":
 
 # ------------------------------
 elif tab_choice == "🧪 Simulation":
+    # Deferred import
+    import plotly.graph_objs as go
+
+    _use_orjson()
+
     st.title("🧪 Run the Reaction Simulation")
     st.markdown("""
     Use the controls to explore how parameters affect [NaOH] over time.
     """)
 
-    with st.sidebar:
+    with st.sidebar.form("sim_controls"):
         st.subheader("🎛 Simulation Settings")
         parameter = st.selectbox("Parameter to Analyze", ["Temperature", "Volume", "Agitation Rate", "Initial Concentration"])
         with st.expander("⚙ Advanced Settings"):
             A_input = st.number_input("Frequency Factor A (1/s)", value=0.5)
             Ea_input = st.number_input("Activation Energy Ea (J/mol)", value=43094.0)
             T_sim = st.number_input("Temperature (K)", value=298.0)
+        st.form_submit_button("▶ Run Simulation")
 
     k_sim = A_input * np.exp(-Ea_input / (R * T_sim))
     st.metric("Calculated Rate Constant (k)", f"{k_sim:.2e} L/mol·s")
@@ -94,66 +185,40 @@ elif tab_choice == "🧪 Simulation":
     if k_sim > 1:
         st.warning("⚠ High rate constant: NaOH concentration may drop rapidly.")
 
-    data_sets = {
-        "Temperature": {
-            "293K": ([0, 480, 960, 1440, 1920, 2400, 2880], [0.0500, 0.0333, 0.0233, 0.0178, 0.0156, 0.0144, 0.0125]),
-            "303K": ([0, 480, 960, 1440, 1920, 2400, 2880], [0.0500, 0.0256, 0.0189, 0.0144, 0.0122, 0.0100, 0.0078]),
-            "313K": ([0, 480, 960, 1440, 1920, 2400, 2880], [0.0500, 0.0200, 0.0133, 0.0100, 0.0083, 0.0067, 0.0061])
-        },
-        "Volume": {
-            "1.2L": ([0, 480, 960, 1440, 1920, 2400, 2880], [0.0500, 0.0222, 0.0156, 0.0128, 0.0100, 0.0089, 0.0083]),
-            "1.4L": ([0, 480, 960, 1440, 1920, 2400, 2880], [0.0500, 0.0289, 0.0222, 0.0178, 0.0156, 0.0144, 0.0133]),
-            "1.8L": ([0, 480, 960, 1440, 1920, 2400, 2880], [0.0500, 0.031, 0.0289, 0.0256, 0.0222, 0.0200, 0.0167])
-        },
-        "Agitation Rate": {
-            "70rpm": ([0, 480, 960, 1440, 1920, 2400, 2880], [0.0500, 0.0189, 0.0133, 0.0100, 0.0078, 0.0067, 0.0056]),
-            "110rpm": ([0, 480, 960, 1440, 1920, 2400, 2880], [0.0500, 0.0256, 0.0189, 0.0156, 0.0128, 0.0111, 0.0100]),
-            "150rpm": ([0, 480, 960, 1440, 1920, 2400, 2880], [0.0500, 0.0333, 0.0267, 0.0222, 0.0200, 0.0178, 0.0156])
-        },
-        "Initial Concentration": {
-            "0.025M": ([0, 480, 960, 1440, 1920, 2400, 2880], [0.0500, 0.0360, 0.0260, 0.0200, 0.0160, 0.0120, 0.0111]),
-            "0.050M": ([0, 480, 960, 1440, 1920, 2400, 2880], [0.0500, 0.0389, 0.0300, 0.0244, 0.0211, 0.0189, 0.0167]),
-            "0.075M": ([0, 480, 960, 1440, 1920, 2400, 2880], [0.0500, 0.0392, 0.0313, 0.0256, 0.0222, 0.0200, 0.0178])
-        }
-    }
-
-    fig = go.Figure()
     exp_colors = ['red', 'green', 'blue']
     sim_colors = ['orange', 'lime', 'deepskyblue']
 
-    for i, (label, (time_exp, conc_exp)) in enumerate(data_sets[parameter].items()):
-        time_exp_min = np.array(time_exp) / 60
-        conc_exp = np.array(conc_exp)
-
-        fig.add_trace(go.Scatter(x=time_exp_min, y=conc_exp, mode='lines+markers', name=f"Exp {label}",
-                                 line=dict(color=exp_colors[i], width=2)))
-
-        def ode_model(C, t, k): return -k * C**2
-        C0 = conc_exp[0]
-        time_sim_sec = np.array(time_exp)
-
-        try:
-            temp_val = int(label.replace("K", ""))
-            k_temp = A_input * np.exp(-Ea_input / (R * temp_val))
-        except:
-            k_temp = k_sim
-
-        conc_sim = odeint(ode_model, C0, time_sim_sec, args=(k_temp,))
-        time_sim_min = time_sim_sec / 60
-
-        fig.add_trace(go.Scatter(x=time_sim_min, y=conc_sim.flatten(), mode='lines+markers',
-                                 name=f"Sim {label}", line=dict(color=sim_colors[i], width=2, dash='dash')))
-
-    fig.update_layout(
-        title=f"[NaOH] vs Time — Effect of {parameter}",
-        xaxis_title="Time (minutes)",
-        yaxis_title="[NaOH] (mol/L)",
-        template="plotly_white",
-        hovermode="x unified",
-        font=dict(size=14)
-    )
-
-    st.plotly_chart(fig, use_container_width=True)
+    # Figure skeleton, built once per session
+    if "fig" not in st.session_state:
+        # Traces alternate Exp/Sim per label
+        skeleton = go.Figure()
+        skeleton.add_traces([
+            go.Scattergl(mode='lines+markers', hovertemplate=_HOVER_TEMPLATE,
+                         line=dict(color=color, width=2, dash=dash))
+            for exp_color, sim_color in zip(exp_colors, sim_colors)
+            for color, dash in ((exp_color, None), (sim_color, 'dash'))
+        ])
+        skeleton.update_layout(
+            xaxis_title="Time (minutes)",
+            yaxis_title="[NaOH] (mol/L)",
+            template="plotly_white",
+            hovermode="closest",
+            font=dict(size=14),
+            uirevision="sim",
+            transition_duration=0
+        )
+        st.session_state["fig"] = skeleton
+
+    fig = st.session_state["fig"]
+
+    # Refill only when inputs change
+    sim_key = (parameter, A_input, Ea_input, T_sim)
+    if st.session_state.get("sim_key") != sim_key:
+        update_fig(fig, *sim_key)
+        st.session_state["sim_key"] = sim_key
+
+    st.plotly_chart(fig, use_container_width=True, key="sim_chart",
+                    config={'responsive': True, 'doubleClick': 'reset', 'staticPlot': False})
     st.success("✅ Graph plotted. Hover to inspect experimental and simulated data.")
 
 # ------------------------------